@@ -2,9 +2,11 @@
 
 Cache layout:
     ~/.cache/context7-local/{owner}/{repo}/
-        _meta.json          ← { "fetched_at": <epoch> }
-        _embeddings.npy     ← float32 matrix (N, D) of chunk embeddings
+        _meta.json          ← { "fetched_at": <epoch>,
+                                "etags": {path: etag}, "shas": {path: sha} }
+        _embeddings.npy     ← float16 matrix (N, D) of chunk embeddings
         _chunk_ids.json     ← list of chunk source+title identifiers
+        _chunks.json        ← pre-computed chunk rows [title, content, source]
         readme.md
         docs/path/to/file.md
 """
@@ -15,12 +17,31 @@ import json
 import logging
 import os
 import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 import numpy as np
 
+try:  # optional: Rust-SIMD JSON parser, ~5× faster than stdlib on reads
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 log = logging.getLogger("context7-local")
 
+
+def _json_loads(data: bytes) -> dict | list:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _json_dumps(obj: dict | list) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
 _DEFAULT_CACHE_DIR = Path.home() / ".cache" / "context7-local"
 _DEFAULT_TTL_HOURS = 7 * 24  # 7 days
 
@@ -38,17 +59,43 @@ def _meta_path(owner: str, repo: str) -> Path:
     return _cache_dir() / owner / repo / "_meta.json"
 
 
+def _write_atomic(dest: Path, data: bytes) -> None:
+    """Write *data* to *dest* via a temp file + atomic rename.
+
+    A crash or concurrent reader mid-write can never observe a torn
+    file; os.replace is atomic on POSIX and Windows.
+    """
+    tmp = dest.with_name(dest.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, dest)
+
+
+@lru_cache(maxsize=1024)
+def _read_meta(meta_path: str, mtime_ns: int) -> dict | None:
+    """Parse a _meta.json file, memoized on (path, mtime).
+
+    The mtime key makes file modifications invalidate the cache entry
+    automatically, so hot repos skip the read+parse on every tool call.
+    Callers must treat the returned dict as read-only.
+    """
+    try:
+        return _json_loads(Path(meta_path).read_bytes())  # type: ignore[return-value]
+    except (ValueError, OSError):
+        return None
+
+
 def is_cached(owner: str, repo: str) -> bool:
     """Return True if docs for this repo are cached and not expired."""
     meta = _meta_path(owner, repo)
-    if not meta.exists():
-        return False
     try:
-        data = json.loads(meta.read_text())
-        fetched_at = data.get("fetched_at", 0)
-        return (time.time() - fetched_at) < _ttl_seconds()
-    except (json.JSONDecodeError, OSError):
+        mtime_ns = meta.stat().st_mtime_ns
+    except OSError:
         return False
+    data = _read_meta(str(meta), mtime_ns)
+    if data is None:
+        return False
+    fetched_at = data.get("fetched_at", 0)
+    return (time.time() - fetched_at) < _ttl_seconds()
 
 
 def save_doc(owner: str, repo: str, relative_path: str, content: str) -> None:
@@ -58,28 +105,110 @@ def save_doc(owner: str, repo: str, relative_path: str, content: str) -> None:
     dest.write_text(content, encoding="utf-8")
 
 
-def mark_fetched(owner: str, repo: str) -> None:
-    """Write or update the metadata timestamp for a cached repo."""
+def has_doc(owner: str, repo: str, relative_path: str) -> bool:
+    """Return True if a document exists in the cache (ignores TTL)."""
+    return (_cache_dir() / owner / repo / relative_path).exists()
+
+
+def load_meta(owner: str, repo: str) -> dict:
+    """Load the metadata dict for a cached repo ({} if missing/corrupt)."""
+    meta = _meta_path(owner, repo)
+    try:
+        mtime_ns = meta.stat().st_mtime_ns
+    except OSError:
+        return {}
+    return _read_meta(str(meta), mtime_ns) or {}
+
+
+def mark_fetched(
+    owner: str,
+    repo: str,
+    etags: dict[str, str] | None = None,
+    shas: dict[str, str] | None = None,
+) -> None:
+    """Write or update the metadata timestamp (and HTTP validators) for a repo.
+
+    Args:
+        owner: GitHub owner/organisation.
+        repo: GitHub repository name.
+        etags: Optional map of cached path → ETag for conditional re-fetch.
+        shas: Optional map of cached path → git blob sha.
+    """
     meta = _meta_path(owner, repo)
     meta.parent.mkdir(parents=True, exist_ok=True)
-    meta.write_text(json.dumps({"fetched_at": time.time()}))
+    data: dict = {"fetched_at": time.time()}
+    if etags:
+        data["etags"] = etags
+    if shas:
+        data["shas"] = shas
+    _write_atomic(meta, _json_dumps(data))
+
+
+_CHUNKS_FILE = "_chunks.json"
+
+
+def save_chunks(owner: str, repo: str, rows: list[list[str]]) -> None:
+    """Persist pre-computed chunk rows ([title, content, source]) for a repo.
+
+    Chunking is deterministic on content, so it is done once at fetch time
+    and queries deserialise this file instead of re-parsing every doc.
+    """
+    base = _cache_dir() / owner / repo
+    base.mkdir(parents=True, exist_ok=True)
+    _write_atomic(base / _CHUNKS_FILE, _json_dumps(rows))
+
+
+def load_chunks(owner: str, repo: str) -> list[list[str]] | None:
+    """Load pre-computed chunk rows (None if missing/corrupt)."""
+    path = _cache_dir() / owner / repo / _CHUNKS_FILE
+    try:
+        return _json_loads(path.read_bytes())  # type: ignore[return-value]
+    except (ValueError, OSError):
+        return None
+
+
+def _walk_md(root: str, rel_prefix: str = "") -> Iterator[tuple[str, str]]:
+    """Yield (absolute_path, relative_path) for Markdown files under *root*.
+
+    Uses os.scandir so file-type checks come from the directory entries
+    themselves instead of a stat() per path (rglob allocates a Path and
+    re-stats at every node). Metadata entries (``_``-prefixed) are
+    skipped during iteration rather than post-filtered.
+    """
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.name.startswith("_"):
+                continue  # skip metadata
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_md(entry.path, f"{rel_prefix}{entry.name}/")
+            elif entry.name.endswith(".md") and entry.is_file(follow_symlinks=False):
+                yield entry.path, f"{rel_prefix}{entry.name}"
+
+
+_PARALLEL_READ_THRESHOLD = 8  # below this, thread-pool overhead outweighs the win
+
+
+def _read_text(path: str) -> str:
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return f.read()
 
 
 def load_all_docs(owner: str, repo: str) -> dict[str, str]:
     """Load all cached Markdown files for a repo.
 
-    Returns a dict mapping relative paths to their text content.
+    Returns a dict mapping relative paths to their text content. Larger
+    doc sets are read through a thread pool — the GIL is released during
+    read(), so cold-cache I/O overlaps across files.
     """
     base = _cache_dir() / owner / repo
     if not base.exists():
         return {}
-    result: dict[str, str] = {}
-    for md_file in base.rglob("*.md"):
-        rel = str(md_file.relative_to(base))
-        if rel.startswith("_"):
-            continue  # skip metadata
-        result[rel] = md_file.read_text(encoding="utf-8", errors="replace")
-    return result
+    entries = list(_walk_md(str(base)))
+    if len(entries) < _PARALLEL_READ_THRESHOLD:
+        return {rel: _read_text(abs_path) for abs_path, rel in entries}
+    with ThreadPoolExecutor(max_workers=min(32, len(entries))) as pool:
+        contents = pool.map(_read_text, (abs_path for abs_path, _ in entries))
+        return {rel: content for (_, rel), content in zip(entries, contents, strict=True)}
 
 
 # ---------------------------------------------------------------------------
@@ -88,6 +217,13 @@ def load_all_docs(owner: str, repo: str) -> dict[str, str]:
 
 _EMBED_MATRIX_FILE = "_embeddings.npy"
 _EMBED_IDS_FILE = "_chunk_ids.json"
+_EMBED_HASHES_FILE = "_chunk_hashes.json"
+_EMBED_SCALE_FILE = "_embed_scale.json"
+
+
+def _embed_cache_dtype() -> str:
+    """Storage dtype for the embedding matrix: 'float16' or 'int8'."""
+    return os.environ.get("EMBED_CACHE_DTYPE", "float16")
 
 
 def save_embeddings(
@@ -95,21 +231,54 @@ def save_embeddings(
     repo: str,
     chunk_ids: list[str],
     matrix: np.ndarray,
+    chunk_hashes: list[str] | None = None,
 ) -> None:
     """Persist chunk embeddings alongside markdown files.
 
+    The matrix is stored as float16 by default: the vectors are
+    L2-normalised, so half precision loses nothing measurable in cosine
+    ordering while halving disk footprint and load bandwidth. Setting
+    EMBED_CACHE_DTYPE=int8 quantises symmetrically with one per-matrix
+    scale instead (4× smaller than float32); ranking is scale-invariant,
+    and the scale is kept in a sidecar for anyone needing real values.
+
     Args:
         owner: GitHub owner/organisation.
         repo: GitHub repository name.
         chunk_ids: List of stable identifiers for each chunk row (source + title).
-        matrix: float32 numpy array of shape (len(chunk_ids), embedding_dim).
+        matrix: float numpy array of shape (len(chunk_ids), embedding_dim).
+        chunk_hashes: Optional per-row content hashes, enabling partial
+            reuse of rows when chunks are added, removed, or reordered.
     """
     base = _cache_dir() / owner / repo
     base.mkdir(parents=True, exist_ok=True)
-    np.save(str(base / _EMBED_MATRIX_FILE), matrix)
-    (base / _EMBED_IDS_FILE).write_text(
-        json.dumps(chunk_ids, ensure_ascii=False), encoding="utf-8"
-    )
+    if _embed_cache_dtype() == "int8":
+        peak = float(np.max(np.abs(matrix))) if matrix.size else 0.0
+        scale = 127.0 / peak if peak else 1.0
+        stored = np.rint(np.asarray(matrix, dtype=np.float32) * scale).astype(np.int8)
+        _write_atomic(base / _EMBED_SCALE_FILE, _json_dumps({"scale": scale}))
+    else:
+        stored = matrix.astype(np.float16)
+    # Write-then-rename: the matrix is the most expensive artifact in the
+    # cache (O(N) ONNX inferences to rebuild), so it must never be torn.
+    # np.save gets an open handle — given a path it would append ".npy".
+    matrix_tmp = base / (_EMBED_MATRIX_FILE + ".tmp")
+    with open(matrix_tmp, "wb") as f:
+        # C-contiguous layout keeps mmap strides optimal for row-wise access.
+        np.save(f, np.ascontiguousarray(stored))
+    os.replace(matrix_tmp, base / _EMBED_MATRIX_FILE)
+    _write_atomic(base / _EMBED_IDS_FILE, _json_dumps(chunk_ids))
+    if chunk_hashes is not None:
+        _write_atomic(base / _EMBED_HASHES_FILE, _json_dumps(chunk_hashes))
+
+
+def load_chunk_hashes(owner: str, repo: str) -> list[str] | None:
+    """Load the per-row content hashes saved alongside the embeddings."""
+    path = _cache_dir() / owner / repo / _EMBED_HASHES_FILE
+    try:
+        return _json_loads(path.read_bytes())  # type: ignore[return-value]
+    except (ValueError, OSError):
+        return None
 
 
 def load_embeddings(
@@ -127,8 +296,10 @@ def load_embeddings(
     if not matrix_path.exists() or not ids_path.exists():
         return None
     try:
-        matrix: np.ndarray = np.load(str(matrix_path))
-        chunk_ids: list[str] = json.loads(ids_path.read_text(encoding="utf-8"))
+        # Memory-map so the OS pages in rows on demand instead of reading
+        # the whole (N, D) matrix into RAM on every query.
+        matrix: np.ndarray = np.load(str(matrix_path), mmap_mode="r")
+        chunk_ids: list[str] = _json_loads(ids_path.read_bytes())  # type: ignore[assignment]
         return chunk_ids, matrix
     except (OSError, ValueError):
         log.warning("Failed to load embedding cache for %s/%s", owner, repo, exc_info=True)
@@ -2,23 +2,24 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import TYPE_CHECKING
-
-if TYPE_CHECKING:
-    import numpy as np
+import sys
+from dataclasses import dataclass
 
 _MAX_CHUNK_CHARS = 2000
 
 
 @dataclass(frozen=True, slots=True)
 class Chunk:
-    """A section of a Markdown document."""
+    """A section of a Markdown document.
+
+    Embeddings are deliberately not stored per chunk — they live in the
+    contiguous matrix persisted by ``cache.save_embeddings``, keyed by
+    row index.
+    """
 
     title: str
     content: str
     source: str  # file path or identifier
-    embedding: np.ndarray | None = field(default=None, compare=False, hash=False)
 
 
 def chunk_markdown(text: str, source: str = "") -> list[Chunk]:
@@ -29,42 +30,58 @@ def chunk_markdown(text: str, source: str = "") -> list[Chunk]:
       - Never split inside fenced code blocks (``` ... ```).
       - Chunks exceeding *_MAX_CHUNK_CHARS* are hard-truncated.
     """
-    lines = text.splitlines(keepends=True)
     chunks: list[Chunk] = []
+    # Every chunk of a document shares one source path; interning makes the
+    # repeated references point at a single string object.
+    source = sys.intern(source) if source else source
     current_title = source or "(untitled)"
-    current_lines: list[str] = []
+    section_start = 0  # start offset of the current chunk's content
     in_code_block = False
+    pos = 0
+    n = len(text)
 
-    for line in lines:
-        stripped = line.strip()
+    # Single index-based pass: line boundaries come from str.find and
+    # chunk content is sliced straight out of the original string, so no
+    # per-line list (splitlines) or per-chunk join is ever materialised.
+    while pos < n:
+        nl = text.find("\n", pos)
+        line_end = n if nl == -1 else nl + 1
+
+        # Skip leading indentation to find the first significant char
+        i = pos
+        while i < line_end and text[i] in " \t":
+            i += 1
 
         # Track fenced code blocks
-        if stripped.startswith("```"):
+        if i < line_end and text.startswith("```", i):
             in_code_block = not in_code_block
 
         # Detect heading boundaries (only outside code blocks)
         if (
             not in_code_block
-            and stripped.startswith("#")
-            and (stripped.startswith("# ") or stripped.startswith("## "))
+            and i < line_end
+            and text[i] == "#"
+            and (text.startswith("# ", i) or text.startswith("## ", i))
         ):
             # Flush previous chunk
-            if current_lines:
-                chunks.append(_make_chunk(current_title, current_lines, source))
-            current_title = stripped.lstrip("#").strip()
-            current_lines = []
-        else:
-            current_lines.append(line)
+            if pos > section_start:
+                chunks.append(_make_chunk(current_title, text[section_start:pos], source))
+            current_title = text[i:line_end].lstrip("#").strip()
+            section_start = line_end
+
+        pos = line_end
 
     # Flush trailing chunk
-    if current_lines:
-        chunks.append(_make_chunk(current_title, current_lines, source))
+    if n > section_start:
+        chunks.append(_make_chunk(current_title, text[section_start:], source))
 
     return chunks
 
 
-def _make_chunk(title: str, lines: list[str], source: str) -> Chunk:
-    content = "".join(lines).strip()
-    if len(content) > _MAX_CHUNK_CHARS:
-        content = content[:_MAX_CHUNK_CHARS] + "\n…(truncated)"
+def _make_chunk(title: str, content: str, source: str) -> Chunk:
+    if len(content) <= _MAX_CHUNK_CHARS:
+        content = content.strip()
+    else:
+        # Truncate before stripping so the discarded tail is never copied
+        content = content[:_MAX_CHUNK_CHARS].strip() + "\n…(truncated)"
     return Chunk(title=title, content=content, source=source)
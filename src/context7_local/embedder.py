@@ -13,6 +13,7 @@ from __future__ import annotations
 
 import logging
 import os
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 import numpy as np
@@ -23,6 +24,12 @@ if TYPE_CHECKING:
 log = logging.getLogger("context7-local")
 
 _DEFAULT_MODEL = "BAAI/bge-small-en-v1.5"
+_DEFAULT_BATCH_SIZE = 32
+
+
+def _batch_size() -> int:
+    return int(os.environ.get("EMBED_BATCH_SIZE", str(_DEFAULT_BATCH_SIZE)))
+
 
 # Module-level singleton — initialized on first call to embed()
 _model: TextEmbedding | None = None
@@ -41,12 +48,15 @@ def _get_model() -> TextEmbedding:
     return _model
 
 
-def embed_texts(texts: list[str]) -> np.ndarray:
+def embed_texts(texts: list[str], batch_size: int | None = None) -> np.ndarray:
     """Return a (N, D) float32 matrix of L2-normalised embeddings.
 
     Args:
         texts: List of strings to embed. Empty strings are replaced with
                a single space to avoid tokenizer errors.
+        batch_size: Override for the FastEmbed batch size; defaults to
+               EMBED_BATCH_SIZE. Bulk callers embedding a whole corpus
+               benefit from a larger value than interactive ones.
 
     Returns:
         numpy array of shape (len(texts), embedding_dim), dtype=float32,
@@ -57,15 +67,39 @@ def embed_texts(texts: list[str]) -> np.ndarray:
 
     safe_texts = [t if t.strip() else " " for t in texts]
     model = _get_model()
-    # fastembed.embed() returns a generator of np.ndarray
-    vecs: np.ndarray = np.array(list(model.embed(safe_texts)), dtype=np.float32)
-
-    # L2-normalise so cosine similarity == dot product
-    norms = np.linalg.norm(vecs, axis=1, keepdims=True)
-    norms = np.where(norms == 0, 1.0, norms)  # avoid div-by-zero
-    return (vecs / norms).astype(np.float32)
+    # fastembed.embed() returns a generator of np.ndarray — write rows
+    # straight into a preallocated buffer instead of materialising a
+    # Python list and copying it again via np.array().
+    vec_iter = iter(model.embed(safe_texts, batch_size=batch_size or _batch_size()))
+    first = np.asarray(next(vec_iter), dtype=np.float32)
+    out = np.empty((len(safe_texts), first.shape[0]), dtype=np.float32)
+    out[0] = first
+    for i, vec in enumerate(vec_iter, start=1):
+        out[i] = vec
+
+    # L2-normalise in place so cosine similarity == dot product.
+    # Squared norms via a single fused einsum; an epsilon floor replaces
+    # the zero-norm branch (BGE vectors are never near zero in practice),
+    # and the scale is applied in place — one pass over the matrix.
+    sq = np.einsum("ij,ij->i", out, out)
+    np.maximum(sq, 1e-12, out=sq)
+    np.sqrt(sq, out=sq)
+    np.reciprocal(sq, out=sq)
+    out *= sq[:, None]
+    return out
+
+
+@lru_cache(maxsize=256)
+def _cached_query_vec(query: str) -> np.ndarray:
+    return embed_texts([query])[0]
 
 
 def embed_query(query: str) -> np.ndarray:
-    """Return a (D,) unit vector for a single query string."""
-    return embed_texts([query])[0]
+    """Return a (D,) unit vector for a single query string.
+
+    Vectors are memoized (LRU, 256 entries) on the whitespace-stripped
+    query, so the repeated identical queries typical of interactive tool
+    use skip the model pass entirely. Callers must treat the returned
+    array as read-only.
+    """
+    return _cached_query_vec(query.strip())
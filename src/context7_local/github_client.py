@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import json
 import logging
 import os
 from dataclasses import dataclass
@@ -17,9 +18,17 @@ from typing import Any
 
 import httpx
 
+from context7_local import http
+
+try:  # optional: same fast-JSON fallback pattern as cache
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 _GITHUB_API = "https://api.github.com"
 _MAX_RETRIES = 3
 _BACKOFF_BASE = 1.0  # seconds: 1, 2, 4
+_WALK_CONCURRENCY = 5  # concurrent directory listings per docs-tree walk
 
 log = logging.getLogger("context7-local")
 
@@ -41,6 +50,30 @@ class RepoInfo:
         return f"/{self.owner}/{self.repo}"
 
 
+@dataclass(frozen=True, slots=True)
+class FetchedDoc:
+    """A fetched document plus its HTTP cache validator.
+
+    ``not_modified`` is True when the server answered 304 — the caller's
+    cached copy is still current and ``content`` is empty.
+    """
+
+    content: str
+    etag: str | None = None
+    not_modified: bool = False
+
+
+def _json_body(resp: httpx.Response) -> Any:
+    """Decode a JSON response body, via orjson when installed.
+
+    GitHub search/contents payloads run to hundreds of KB; orjson decodes
+    them a few times faster than the stdlib parser behind resp.json().
+    """
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return json.loads(resp.content)
+
+
 def _timeout() -> float:
     return float(os.environ.get("GITHUB_TIMEOUT", "30"))
 
@@ -53,15 +86,27 @@ def _headers() -> dict[str, str]:
     return headers
 
 
-def _make_client() -> httpx.AsyncClient:
-    """Create a shared AsyncClient (caller manages lifecycle)."""
-    return httpx.AsyncClient(
+def _get_client() -> httpx.AsyncClient:
+    """Return the process-global GitHub API client.
+
+    Lazily constructed via the shared pool so connection pooling (and
+    HTTP/2 multiplexing when h2 is installed) applies across all API
+    calls instead of paying a TCP+TLS handshake per request. Kept
+    separate from the scraper's client: this one carries auth headers.
+    """
+    return http.get_client(
+        "github",
         base_url=_GITHUB_API,
         headers=_headers(),
         timeout=_timeout(),
     )
 
 
+async def aclose_client() -> None:
+    """Close the shared clients (call on server shutdown)."""
+    await http.aclose_clients()
+
+
 async def _request_with_retry(
     client: httpx.AsyncClient,
     method: str,
@@ -99,36 +144,46 @@ async def search_repositories(query: str, max_results: int = 5) -> list[RepoInfo
 
     Returns up to *max_results* matches sorted by stars.
     """
-    async with _make_client() as client:
-        resp = await _request_with_retry(
-            client,
-            "GET",
-            "/search/repositories",
-            params={"q": query, "per_page": max_results, "sort": "stars"},
+    client = _get_client()
+    resp = await _request_with_retry(
+        client,
+        "GET",
+        "/search/repositories",
+        params={"q": query, "per_page": max_results, "sort": "stars"},
+    )
+    resp.raise_for_status()
+    items = _json_body(resp).get("items", [])
+    return [
+        RepoInfo(
+            owner=item["owner"]["login"],
+            repo=item["name"],
+            description=item.get("description") or "",
+            stars=item.get("stargazers_count", 0),
+            language=item.get("language") or "Unknown",
         )
-        resp.raise_for_status()
-        items = resp.json().get("items", [])
-        return [
-            RepoInfo(
-                owner=item["owner"]["login"],
-                repo=item["name"],
-                description=item.get("description") or "",
-                stars=item.get("stargazers_count", 0),
-                language=item.get("language") or "Unknown",
-            )
-            for item in items
-        ]
+        for item in items
+    ]
+
 
+async def fetch_readme(owner: str, repo: str, etag: str | None = None) -> FetchedDoc | None:
+    """Fetch the decoded README content for a repository.
 
-async def fetch_readme(owner: str, repo: str) -> str | None:
-    """Fetch the decoded README content for a repository."""
-    async with _make_client() as client:
-        resp = await _request_with_retry(client, "GET", f"/repos/{owner}/{repo}/readme")
-        if resp.status_code == 404:
-            return None
-        resp.raise_for_status()
-        data = resp.json()
-        return _decode_content(data)
+    When *etag* is given it is sent as ``If-None-Match``; a 304 response
+    skips the (potentially large) base64 body entirely and is reported
+    via ``FetchedDoc.not_modified``.
+    """
+    client = _get_client()
+    headers = {"If-None-Match": etag} if etag else None
+    resp = await _request_with_retry(
+        client, "GET", f"/repos/{owner}/{repo}/readme", headers=headers
+    )
+    if resp.status_code == 404:
+        return None
+    if resp.status_code == 304:
+        return FetchedDoc(content="", etag=etag, not_modified=True)
+    resp.raise_for_status()
+    data = _json_body(resp)
+    return FetchedDoc(content=_decode_content(data), etag=resp.headers.get("etag"))
 
 
 async def list_docs_directory(
@@ -139,8 +194,10 @@ async def list_docs_directory(
     Returns a list of dicts with ``path`` and ``sha`` keys.
     """
     results: list[dict[str, str]] = []
-    async with _make_client() as client:
-        await _walk_tree(client, owner, repo, path, max_depth, 0, results)
+    # Shared across the whole walk so concurrent descents stay within
+    # GitHub's secondary rate limits.
+    sem = asyncio.Semaphore(_WALK_CONCURRENCY)
+    await _walk_tree(_get_client(), owner, repo, path, max_depth, 0, results, sem)
     return results
 
 
@@ -152,38 +209,53 @@ async def _walk_tree(
     max_depth: int,
     current_depth: int,
     acc: list[dict[str, str]],
+    sem: asyncio.Semaphore,
 ) -> None:
     if current_depth >= max_depth:
         return
-    resp = await _request_with_retry(client, "GET", f"/repos/{owner}/{repo}/contents/{path}")
+    async with sem:
+        resp = await _request_with_retry(client, "GET", f"/repos/{owner}/{repo}/contents/{path}")
     if resp.status_code == 404:
         return
     resp.raise_for_status()
-    items = resp.json()
+    items = _json_body(resp)
     if not isinstance(items, list):
         return
+    subdirs: list[str] = []
     for item in items:
         if item["type"] == "file" and item["name"].lower().endswith(".md"):
             acc.append({"path": item["path"], "sha": item["sha"]})
         elif item["type"] == "dir":
-            await _walk_tree(
-                client,
-                owner,
-                repo,
-                item["path"],
-                max_depth,
-                current_depth + 1,
-                acc,
+            subdirs.append(item["path"])
+    # Descend into sibling directories concurrently instead of one at a time
+    if subdirs:
+        await asyncio.gather(
+            *(
+                _walk_tree(client, owner, repo, sub, max_depth, current_depth + 1, acc, sem)
+                for sub in subdirs
             )
+        )
 
 
 async def fetch_blob(owner: str, repo: str, sha: str) -> str:
-    """Fetch file content by blob SHA (handles files > 1 MB)."""
-    async with _make_client() as client:
-        resp = await _request_with_retry(client, "GET", f"/repos/{owner}/{repo}/git/blobs/{sha}")
-        resp.raise_for_status()
-        data = resp.json()
-        return _decode_content(data)
+    """Fetch file content by blob SHA (handles files > 1 MB).
+
+    Requests the raw media type so the server sends file bytes directly
+    instead of a JSON envelope whose base64 payload is ~33% larger and
+    must be fully parsed and decoded in memory.
+    """
+    client = _get_client()
+    resp = await _request_with_retry(
+        client,
+        "GET",
+        f"/repos/{owner}/{repo}/git/blobs/{sha}",
+        headers={"Accept": "application/vnd.github.raw+json"},
+    )
+    resp.raise_for_status()
+    if resp.headers.get("content-type", "").startswith("application/json"):
+        # Server ignored the raw media type — fall back to the JSON envelope
+        return _decode_content(_json_body(resp))
+    return resp.text
 
 
 def _decode_content(data: dict[str, str]) -> str:
@@ -202,13 +274,13 @@ async def fetch_homepage_url(owner: str, repo: str) -> str | None:
     (e.g. FastAPI declares https://fastapi.tiangolo.com).
     Returns None if the field is empty or the request fails.
     """
-    async with _make_client() as client:
-        resp = await _request_with_retry(client, "GET", f"/repos/{owner}/{repo}")
-        if resp.status_code == 404:
-            return None
-        resp.raise_for_status()
-        data = resp.json()
-        homepage = data.get("homepage", "")
-        if homepage and isinstance(homepage, str) and homepage.startswith("http"):
-            return homepage
+    client = _get_client()
+    resp = await _request_with_retry(client, "GET", f"/repos/{owner}/{repo}")
+    if resp.status_code == 404:
         return None
+    resp.raise_for_status()
+    data = _json_body(resp)
+    homepage = data.get("homepage", "")
+    if homepage and isinstance(homepage, str) and homepage.startswith("http"):
+        return homepage
+    return None
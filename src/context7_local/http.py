@@ -0,0 +1,60 @@
+"""Process-global httpx client pool shared across modules.
+
+Every module that talks HTTP (GitHub API, website scraper) gets its
+client from here, so TCP+TLS sessions are set up once per process and
+reused across tool calls instead of per call site. Clients are named:
+the GitHub client carries auth headers that must never be sent to
+scraped third-party sites, so it cannot share a client object with the
+scraper — but both share this lifecycle management.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+from typing import Any
+
+import httpx
+
+log = logging.getLogger("context7-local")
+
+# HTTP/2 multiplexes concurrent requests over one connection; requires
+# the optional h2 extra (installed via httpx[http2]).
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_clients: dict[str, httpx.AsyncClient] = {}
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_client(name: str, **kwargs: Any) -> httpx.AsyncClient:
+    """Return the shared client *name*, creating it on first use.
+
+    *kwargs* are passed to ``httpx.AsyncClient`` only when the client is
+    first constructed. Clients are bound to the event loop they were
+    created on; if the running loop changed (e.g. between test runs),
+    the pool is rebuilt.
+    """
+    global _client_loop  # noqa: PLW0603
+    loop = asyncio.get_running_loop()
+    if _client_loop is not loop:
+        _clients.clear()
+        _client_loop = loop
+    client = _clients.get(name)
+    if client is None:
+        kwargs.setdefault("http2", HTTP2_AVAILABLE)
+        client = httpx.AsyncClient(**kwargs)
+        _clients[name] = client
+    return client
+
+
+async def aclose_clients() -> None:
+    """Close every shared client (call on server shutdown)."""
+    global _client_loop  # noqa: PLW0603
+    for client in _clients.values():
+        try:
+            await client.aclose()
+        except Exception:  # noqa: BLE001 — best-effort shutdown
+            log.debug("Error closing shared client", exc_info=True)
+    _clients.clear()
+    _client_loop = None
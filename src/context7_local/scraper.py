@@ -6,18 +6,57 @@ extracts clean text from HTML, and returns docs ready for caching.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import re
+from collections import deque
+from functools import lru_cache
+from typing import TYPE_CHECKING
 from urllib.parse import urljoin, urlparse
 
 import httpx
-from bs4 import BeautifulSoup, Tag
+
+from context7_local import http
+
+if TYPE_CHECKING:
+    import lxml.html
 
 log = logging.getLogger("context7-local")
 
 _STRIP_TAGS = {"nav", "header", "footer", "script", "style", "aside", "svg", "form"}
+_HTML_CONTENT_TYPES = frozenset({"text/html", "application/xhtml+xml"})
 _MAX_PAGE_CHARS = 200_000  # skip absurdly large pages
 _REQUEST_TIMEOUT = 15.0
+_CONCURRENCY = 8  # simultaneous page fetches per crawl
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the process-global scraping client.
+
+    Shared via the pool in context7_local.http so TLS sessions persist
+    across crawls (and across the GitHub stages of the same tool call).
+    Deliberately distinct from the GitHub client, which carries auth
+    headers that must not reach scraped sites.
+    """
+    return http.get_client(
+        "scrape",
+        timeout=_REQUEST_TIMEOUT,
+        follow_redirects=True,
+        headers={"User-Agent": "context7-local/0.1"},
+        limits=httpx.Limits(
+            max_connections=_CONCURRENCY,
+            max_keepalive_connections=_CONCURRENCY,
+        ),
+    )
+
+
+# Compiled once — these run on every scraped page / discovered URL
+_RE_BLANKLINES = re.compile(r"\n{3,}")
+_RE_PATH_SANITIZE = re.compile(r"[^a-zA-Z0-9_/.-]")
+
+# Hrefs that can never lead to a crawlable page — rejected before any
+# urljoin/urlparse work (tuple startswith is a single C call).
+_BAD_PREFIX = ("#", "mailto:", "javascript:", "tel:", "data:")
 
 
 async def scrape_docs_site(
@@ -42,41 +81,46 @@ async def scrape_docs_site(
         return {}
 
     visited: set[str] = set()
+    queued: set[str] = {_normalize_url(base_url)}  # normalized URLs already enqueued
     results: dict[str, str] = {}
-    # BFS queue: (url, depth)
-    queue: list[tuple[str, int]] = [(base_url, 0)]
+    # BFS queue: (url, depth) — deque gives O(1) popleft vs list.pop(0)
+    queue: deque[tuple[str, int]] = deque([(base_url, 0)])
 
-    async with httpx.AsyncClient(
-        timeout=_REQUEST_TIMEOUT,
-        follow_redirects=True,
-        headers={"User-Agent": "context7-local/0.1"},
-    ) as client:
-        while queue and len(results) < max_pages:
-            url, depth = queue.pop(0)
+    sem = asyncio.Semaphore(_CONCURRENCY)
+    client = _get_client()
+
+    while queue and len(results) < max_pages:
+        # Pull the next frontier batch (deduped, bounded by remaining budget)
+        batch: list[tuple[str, int]] = []
+        while queue and len(batch) < max_pages - len(results):
+            url, depth = queue.popleft()
             normalized = _normalize_url(url)
             if normalized in visited:
                 continue
             visited.add(normalized)
-
-            try:
-                resp = await client.get(url)
-            except (httpx.HTTPError, OSError) as exc:
-                log.debug("scrape skip %s: %s (%s)", url, type(exc).__name__, exc)
-                continue
-
-            if resp.status_code != 200:
-                continue
-
-            content_type = resp.headers.get("content-type", "")
-            if "text/html" not in content_type:
+            batch.append((url, depth))
+        if not batch:
+            break
+
+        # Fetch the whole frontier concurrently — crawl time becomes
+        # max-of-latencies per batch instead of sum-of-latencies.
+        responses = await asyncio.gather(*(_fetch_page(client, sem, u) for u, _ in batch))
+
+        for (url, depth), html in zip(batch, responses, strict=True):
+            if len(results) >= max_pages:
+                break
+            if html is None:
                 continue
 
-            html = resp.text
-            if len(html) > _MAX_PAGE_CHARS:
-                log.debug("Skip %s: too large (%d > %d)", url, len(html), _MAX_PAGE_CHARS)
-                continue
+            # Parse once per page; extract links before _html_to_markdown
+            # mutates the tree. Skip link discovery entirely once the
+            # queue already covers the remaining page budget.
+            doc = _parse_html(html)
+            page = doc if doc is not None else html
+            want_links = depth < max_depth and len(queue) < max_pages - len(results)
+            links = _extract_links(page, url, domain) if want_links else []
 
-            text = _html_to_markdown(html)
+            text = _html_to_markdown(page)
             if not text or len(text.strip()) < 50:
                 log.debug("Skip %s: text too short (%d)", url, len(text.strip()) if text else 0)
                 continue
@@ -85,48 +129,143 @@ async def scrape_docs_site(
             results[rel_path] = text
             log.info("Scraped %s -> %s (%d chars)", url, rel_path, len(text))
 
-            # Discover links for BFS (only if within depth budget)
-            if depth < max_depth:
-                for link in _extract_links(html, url, domain):
-                    if _normalize_url(link) not in visited:
-                        queue.append((link, depth + 1))
+            # Enqueue discovered links for BFS, deduped at insert time and
+            # capped by the remaining fetch budget
+            for link in links:
+                if len(queue) >= max_pages - len(results):
+                    break
+                normalized_link = _normalize_url(link)
+                if normalized_link not in visited and normalized_link not in queued:
+                    queued.add(normalized_link)
+                    queue.append((link, depth + 1))
 
     log.info("scraped %d pages from %s", len(results), domain)
     return results
 
 
-def _html_to_markdown(html: str) -> str:
-    """Extract clean text from HTML, preserving code blocks as fenced Markdown."""
-    soup = BeautifulSoup(html, "lxml")
+async def _fetch_page(
+    client: httpx.AsyncClient,
+    sem: asyncio.Semaphore,
+    url: str,
+) -> str | None:
+    """Fetch one page, returning its HTML or None if it should be skipped."""
+    async with sem:
+        try:
+            resp = await client.get(url)
+        except (httpx.HTTPError, OSError) as exc:
+            log.debug("scrape skip %s: %s (%s)", url, type(exc).__name__, exc)
+            return None
+
+    if resp.status_code != 200:
+        return None
+
+    ctype = resp.headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    if ctype not in _HTML_CONTENT_TYPES:
+        return None
+
+    # Reject oversized bodies from the header before paying for a decode:
+    # UTF-8 is at most 4 bytes/char, so anything past this bound must also
+    # exceed the char cap below.
+    try:
+        if int(resp.headers.get("content-length", 0)) > 4 * _MAX_PAGE_CHARS:
+            log.debug("Skip %s: content-length too large", url)
+            return None
+    except ValueError:
+        pass
+
+    html = resp.text
+    if len(html) > _MAX_PAGE_CHARS:
+        log.debug("Skip %s: too large (%d > %d)", url, len(html), _MAX_PAGE_CHARS)
+        return None
+
+    return html
+
+
+def _parse_html(html: str) -> lxml.html.HtmlElement | None:
+    """Parse HTML into an lxml tree, or None if unparseable.
+
+    lxml is imported lazily (same pattern as fastembed in embedder) so
+    pure-cache queries that never scrape skip its import cost.
+    """
+    import lxml.etree
+    import lxml.html
+
+    try:
+        return lxml.html.fromstring(html)
+    except (lxml.etree.ParserError, ValueError):
+        return None
+
+
+def _replace_with_text(el: lxml.html.HtmlElement, text: str) -> None:
+    """Remove *el* from the tree, splicing *text* into its place."""
+    parent = el.getparent()
+    if parent is None:
+        return
+    text += el.tail or ""
+    prev = el.getprevious()
+    if prev is not None:
+        prev.tail = (prev.tail or "") + text
+    else:
+        parent.text = (parent.text or "") + text
+    parent.remove(el)
+
+
+def _html_to_markdown(html: str | lxml.html.HtmlElement) -> str:
+    """Extract clean text from HTML, preserving code blocks as fenced Markdown.
+
+    Walks the raw lxml tree directly — dramatically cheaper than a
+    BeautifulSoup traversal. Falls back to BeautifulSoup for HTML that
+    lxml refuses to parse.
+    """
+    doc = _parse_html(html) if isinstance(html, str) else html
+    if doc is None:
+        return _html_to_markdown_bs4(html)  # type: ignore[arg-type]
 
     # Remove unwanted elements
-    for tag_name in _STRIP_TAGS:
-        for el in soup.find_all(tag_name):
-            el.decompose()
+    for el in list(doc.iter(*_STRIP_TAGS)):
+        _replace_with_text(el, "")
 
     # Convert <pre>/<code> blocks to fenced code
-    for pre in soup.find_all("pre"):
-        code_el = pre.find("code")
-        source = code_el if code_el else pre
-        code_text = source.get_text()
+    for pre in list(doc.iter("pre")):
+        code_el = pre.find(".//code")
+        source = code_el if code_el is not None else pre
+        code_text = source.text_content()
         # Detect language from class (e.g. class="language-python")
         lang = _detect_lang(source)
-        pre.replace_with(f"\n```{lang}\n{code_text}\n```\n")
+        _replace_with_text(pre, f"\n```{lang}\n{code_text}\n```\n")
 
     # Extract text
-    text = soup.get_text(separator="\n")
+    text = "\n".join(doc.itertext())
 
     # Clean up excessive blank lines
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _RE_BLANKLINES.sub("\n\n", text)
     return text.strip()
 
 
-def _detect_lang(el: Tag | str) -> str:
-    """Try to extract language hint from a code/pre element's class."""
-    if isinstance(el, str):
+def _html_to_markdown_bs4(html: str) -> str:
+    """BeautifulSoup fallback for HTML that lxml cannot parse."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "lxml")
+    for tag_name in _STRIP_TAGS:
+        for el in soup.find_all(tag_name):
+            el.decompose()
+    text = soup.get_text(separator="\n")
+    return _RE_BLANKLINES.sub("\n\n", text).strip()
+
+
+def _detect_lang(el: object) -> str:
+    """Try to extract language hint from a code/pre element's class.
+
+    Accepts both lxml elements (class is a space-separated string) and
+    BeautifulSoup tags (class is a list of strings).
+    """
+    get = getattr(el, "get", None)
+    if get is None:
         return ""
-    # Tag.get("class") returns list[str] | str | None
-    classes = el.get("class")
+    classes = get("class")
+    if isinstance(classes, str):
+        classes = classes.split()
     if isinstance(classes, list):
         for cls in classes:
             if isinstance(cls, str) and cls.startswith("language-"):
@@ -134,16 +273,14 @@ def _detect_lang(el: Tag | str) -> str:
     return ""
 
 
-def _extract_links(html: str, page_url: str, domain: str) -> list[str]:
+def _extract_links(html: str | lxml.html.HtmlElement, page_url: str, domain: str) -> list[str]:
     """Extract same-domain links from HTML."""
-    soup = BeautifulSoup(html, "lxml")
+    doc = _parse_html(html) if isinstance(html, str) else html
+    if doc is None:
+        return []
     links: list[str] = []
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
-        if isinstance(href, list):
-            href = href[0]
-        # Skip anchors, mailto, javascript
-        if href.startswith(("#", "mailto:", "javascript:")):
+    for href in doc.xpath("//a/@href"):
+        if not href or href.startswith(_BAD_PREFIX):
             continue
         abs_url = urljoin(page_url, href)
         parsed = urlparse(abs_url)
@@ -154,13 +291,19 @@ def _extract_links(html: str, page_url: str, domain: str) -> list[str]:
     return links
 
 
+@lru_cache(maxsize=8192)
 def _normalize_url(url: str) -> str:
-    """Normalize URL for deduplication (strip trailing slash and fragment)."""
+    """Normalize URL for deduplication (strip trailing slash and fragment).
+
+    Memoized: the same URLs recur constantly during a crawl (every page
+    links back to the nav set), and each call otherwise pays a urlparse.
+    """
     parsed = urlparse(url)
     path = parsed.path.rstrip("/") or "/"
     return f"{parsed.netloc}{path}"
 
 
+@lru_cache(maxsize=8192)
 def _url_to_path(url: str, domain: str) -> str:
     """Convert a URL to a cache-friendly relative path ending in .md."""
     parsed = urlparse(url)
@@ -168,7 +311,7 @@ def _url_to_path(url: str, domain: str) -> str:
     if not path:
         path = "index"
     # Sanitize
-    path = re.sub(r"[^a-zA-Z0-9_/.-]", "_", path)
+    path = _RE_PATH_SANITIZE.sub("_", path)
     # Remove existing extension and add .md
     if path.endswith((".html", ".htm")):
         path = path.rsplit(".", 1)[0]
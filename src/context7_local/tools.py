@@ -6,20 +6,40 @@ Uses FastEmbed + Numpy for semantic vector ranking of document chunks.
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
+import os
+import sys
+import time
+from dataclasses import dataclass
 
 import httpx
 import numpy as np
 
+try:  # optional: hand-tuned SIMD kernels for similarity scoring
+    import simsimd
+except ImportError:
+    simsimd = None  # type: ignore[assignment]
+
 from context7_local import cache, chunker, embedder, github_client, scraper
 from context7_local.server import mcp
 
 log = logging.getLogger("context7-local")
 
+_BULK_EMBED_BATCH = 64  # batch size when (re)embedding a whole doc corpus
+_BLOB_CONCURRENCY = 8  # parallel docs/ blob downloads per fetch
+
 # ---------------------------------------------------------------------------
 # Tool 1: resolve-library-id
 # ---------------------------------------------------------------------------
 
+_RESOLVE_TTL_SECONDS = 24 * 3600
+_RESOLVE_CACHE_MAX = 512
+
+# name → (monotonic timestamp, rendered result). Successful lookups only:
+# errors and empty results should retry on the next call.
+_resolve_cache: dict[str, tuple[float, str]] = {}
+
 
 @mcp.tool(name="resolve-library-id")
 async def resolve_library_id(library_name: str) -> str:
@@ -32,6 +52,11 @@ async def resolve_library_id(library_name: str) -> str:
         Formatted text listing matching libraries with IDs, descriptions,
         stars, and primary language.
     """
+    key = library_name.strip().lower()
+    hit = _resolve_cache.get(key)
+    if hit is not None and (time.monotonic() - hit[0]) < _RESOLVE_TTL_SECONDS:
+        return hit[1]
+
     try:
         repos = await github_client.search_repositories(library_name, max_results=5)
     except (httpx.HTTPError, OSError) as exc:
@@ -51,7 +76,11 @@ async def resolve_library_id(library_name: str) -> str:
             f"{r.description or '(no description)'}\n"
             f"  Stars: {r.stars:,} | Language: {r.language}"
         )
-    return "\n\n".join(lines)
+    result = "\n\n".join(lines)
+    if len(_resolve_cache) >= _RESOLVE_CACHE_MAX:
+        _resolve_cache.pop(next(iter(_resolve_cache)))  # FIFO eviction
+    _resolve_cache[key] = (time.monotonic(), result)
+    return result
 
 
 # ---------------------------------------------------------------------------
@@ -87,21 +116,31 @@ async def query_docs(library_id: str, query: str) -> str:
                 f"{type(exc).__name__}. Check network or set GITHUB_TOKEN."
             )
 
-    # Load cached docs
-    docs = cache.load_all_docs(owner, repo)
-    if not docs:
-        return f"No documentation found for {library_id}."
-
-    # Chunk all cached markdown
-    all_chunks: list[chunker.Chunk] = []
-    for path, content in docs.items():
-        all_chunks.extend(chunker.chunk_markdown(content, source=path))
+    # Prefer chunks persisted at fetch time; fall back to re-chunking the
+    # raw docs (and persisting) for caches written by older versions.
+    rows = cache.load_chunks(owner, repo)
+    if rows:
+        all_chunks = [
+            # Interned source: JSON gives every row its own copy of what is
+            # really a handful of distinct file paths.
+            chunker.Chunk(title=title, content=content, source=sys.intern(source))
+            for title, content, source in rows
+        ]
+    else:
+        docs = cache.load_all_docs(owner, repo)
+        if not docs:
+            return f"No documentation found for {library_id}."
+        all_chunks = _chunk_docs(docs)
+        cache.save_chunks(owner, repo, [[c.title, c.content, c.source] for c in all_chunks])
 
     if not all_chunks:
         return f"Documentation for {library_id} could not be chunked."
 
-    # --- Semantic ranking ---
-    ranked = await _rank_chunks_semantic(query, owner, repo, all_chunks, top_k=5)
+    # --- Ranking ---
+    if os.environ.get("CONTEXT7_RANKER", "semantic") == "tfidf":
+        ranked = _rank_chunks(query, all_chunks, top_k=5)
+    else:
+        ranked = await _rank_chunks_semantic(query, owner, repo, all_chunks, top_k=5)
 
     # Format output
     sections: list[str] = []
@@ -120,68 +159,227 @@ async def _fetch_and_cache(owner: str, repo: str) -> None:
 
     Network errors are caught per-stage so a partial fetch (e.g. README
     succeeds but /docs times out) still caches whatever was retrieved.
+
+    On TTL-expired refreshes, HTTP validators from the previous fetch are
+    replayed: the README is requested with If-None-Match, and doc blobs
+    whose git sha is unchanged are not re-downloaded at all.
+
+    The three stages share no data, so they run concurrently — the whole
+    fetch costs roughly the slowest stage instead of the sum of all three.
     """
-    # Stage 1: README
-    try:
-        readme = await github_client.fetch_readme(owner, repo)
-        if readme:
-            cache.save_doc(owner, repo, "readme.md", readme)
-    except (httpx.HTTPError, OSError) as exc:
-        log.warning("Failed to fetch README for %s/%s: %s", owner, repo, exc)
+    meta = cache.load_meta(owner, repo)
+    old_etags: dict[str, str] = meta.get("etags", {})
+    old_shas: dict[str, str] = meta.get("shas", {})
+    etags: dict[str, str] = {}
+    shas: dict[str, str] = {}
 
-    # Stage 2: docs/ directory tree
-    try:
-        doc_files = await github_client.list_docs_directory(owner, repo, path="docs")
-        for entry in doc_files:
+    async def _stage_readme() -> None:
+        try:
+            readme = await github_client.fetch_readme(owner, repo, etag=old_etags.get("readme.md"))
+            if readme is not None:
+                if readme.not_modified:
+                    log.debug("README for %s/%s unchanged (304)", owner, repo)
+                elif readme.content:
+                    cache.save_doc(owner, repo, "readme.md", readme.content)
+                if readme.etag:
+                    etags["readme.md"] = readme.etag
+        except (httpx.HTTPError, OSError) as exc:
+            log.warning("Failed to fetch README for %s/%s: %s", owner, repo, exc)
+
+    async def _stage_docs() -> None:
+        sem = asyncio.Semaphore(_BLOB_CONCURRENCY)
+
+        async def _one_blob(path: str, sha: str) -> None:
             try:
-                content = await github_client.fetch_blob(owner, repo, entry["sha"])
-                cache.save_doc(owner, repo, entry["path"], content)
+                async with sem:
+                    content = await github_client.fetch_blob(owner, repo, sha)
+                cache.save_doc(owner, repo, path, content)
+                shas[path] = sha
             except (httpx.HTTPError, OSError) as exc:
-                log.warning("Failed to fetch blob %s: %s", entry["path"], exc)
-    except (httpx.HTTPError, OSError) as exc:
-        log.warning("Failed to list docs/ for %s/%s: %s", owner, repo, exc)
+                log.warning("Failed to fetch blob %s: %s", path, exc)
 
-    # Stage 3: Official documentation website
-    try:
-        homepage = await github_client.fetch_homepage_url(owner, repo)
-        if homepage and _is_docs_url(homepage):
-            scraped = await scraper.scrape_docs_site(homepage)
-            for path, content in scraped.items():
-                cache.save_doc(owner, repo, f"web/{path}", content)
-    except (httpx.HTTPError, OSError) as exc:
-        log.warning("Failed to scrape website for %s/%s: %s", owner, repo, exc)
+        try:
+            doc_files = await github_client.list_docs_directory(owner, repo, path="docs")
+            pending = []
+            for entry in doc_files:
+                path, sha = entry["path"], entry["sha"]
+                if old_shas.get(path) == sha and cache.has_doc(owner, repo, path):
+                    shas[path] = sha  # blob unchanged — keep cached copy
+                else:
+                    pending.append(_one_blob(path, sha))
+            # Blobs are independent: fetch them concurrently, bounded so a
+            # large docs/ tree doesn't stampede the API.
+            await asyncio.gather(*pending)
+        except (httpx.HTTPError, OSError) as exc:
+            log.warning("Failed to list docs/ for %s/%s: %s", owner, repo, exc)
+
+    async def _stage_website() -> None:
+        try:
+            homepage = await github_client.fetch_homepage_url(owner, repo)
+            if homepage and _is_docs_url(homepage):
+                scraped = await scraper.scrape_docs_site(homepage)
+                for path, content in scraped.items():
+                    cache.save_doc(owner, repo, f"web/{path}", content)
+        except (httpx.HTTPError, OSError) as exc:
+            log.warning("Failed to scrape website for %s/%s: %s", owner, repo, exc)
+
+    # Each stage swallows its own network errors, so a failing stage can't
+    # take the others down and gather needs no return_exceptions handling.
+    await asyncio.gather(_stage_readme(), _stage_docs(), _stage_website())
+
+    cache.mark_fetched(owner, repo, etags=etags, shas=shas)
+
+    # Chunking is deterministic on content: do it once per fetch so every
+    # query deserialises the result instead of re-parsing each markdown file.
+    docs = cache.load_all_docs(owner, repo)
+    if docs:
+        all_chunks = _chunk_docs(docs)
+        cache.save_chunks(owner, repo, [[c.title, c.content, c.source] for c in all_chunks])
 
-    cache.mark_fetched(owner, repo)
+
+def _chunk_docs(docs: dict[str, str]) -> list[chunker.Chunk]:
+    """Chunk every cached markdown file into a flat list."""
+    all_chunks: list[chunker.Chunk] = []
+    for path, content in docs.items():
+        all_chunks.extend(chunker.chunk_markdown(content, source=path))
+    return all_chunks
 
 
 # ---------------------------------------------------------------------------
 # Internal: URL filtering for website scraping
 # ---------------------------------------------------------------------------
 
-_SKIP_DOMAINS = {
-    "github.com",
-    "gitlab.com",
-    "npmjs.com",
-    "www.npmjs.com",
-    "pypi.org",
-    "rubygems.org",
-    "crates.io",
-    "pkg.go.dev",
-    "hub.docker.com",
-}
+_SKIP_DOMAINS = frozenset(
+    {
+        "github.com",
+        "gitlab.com",
+        "npmjs.com",
+        "www.npmjs.com",
+        "pypi.org",
+        "rubygems.org",
+        "crates.io",
+        "pkg.go.dev",
+        "hub.docker.com",
+    }
+)
 
 
 def _is_docs_url(url: str) -> bool:
     """Return True if the URL looks like a documentation site worth scraping.
 
     Filters out package registries and source code hosting that we already
-    handle via the GitHub API.
+    handle via the GitHub API. Only the hostname matters, so a direct
+    string scan replaces a full urlparse (which tokenises scheme, path,
+    query, and fragment we never look at).
+    """
+    i = url.find("://")
+    if i < 0:
+        return False
+    j = url.find("/", i + 3)
+    host = url[i + 3 : j if j > 0 else None].lower()
+    if "@" in host:
+        host = host.rsplit("@", 1)[1]  # drop userinfo
+    if ":" in host:
+        host = host.split(":", 1)[0]  # drop port
+    return bool(host) and host not in _SKIP_DOMAINS
+
+
+# ---------------------------------------------------------------------------
+# Internal: lexical ranking (TF-IDF, no embedding model required)
+# ---------------------------------------------------------------------------
+
+# One translation table entry per Latin-1 codepoint: word characters pass
+# through, ASCII uppercase is case-folded, everything else becomes a space.
+_WORD_CHARS = frozenset(map(ord, "abcdefghijklmnopqrstuvwxyz0123456789_"))
+_TOKEN_TABLE = {
+    cp: cp if cp in _WORD_CHARS else (cp + 32 if 0x41 <= cp <= 0x5A else 0x20) for cp in range(256)
+}
+
+
+def _tokenize(text: str) -> list[str]:
+    """Lowercase word tokens for the lexical ranker.
+
+    A single translate-and-split pass at C level — no regex scan and no
+    separate .lower() copy of the chunk body.
     """
-    from urllib.parse import urlparse
+    return text.translate(_TOKEN_TABLE).split()
 
-    parsed = urlparse(url)
-    domain = parsed.netloc.lower()
-    return bool(domain) and domain not in _SKIP_DOMAINS
+
+@dataclass(frozen=True, slots=True)
+class _LexIndex:
+    """Inverted index over a chunk set for TF-IDF scoring.
+
+    postings maps each token to (doc_idx, weight) arrays, where weight is
+    the precomputed length-normalised tf × idf contribution of that token
+    to that document.
+    """
+
+    postings: dict[str, tuple[np.ndarray, np.ndarray]]
+    n_docs: int
+
+
+# Single-entry cache: queries against the same corpus reuse the index.
+_lex_index_cache: tuple[tuple[str, ...], _LexIndex] | None = None
+
+
+def _build_lex_index(chunks: list[chunker.Chunk]) -> _LexIndex:
+    """Tokenize once and build per-token posting lists with final weights."""
+    n_docs = len(chunks)
+    counts: dict[str, dict[int, int]] = {}
+    lengths = np.ones(n_docs, dtype=np.float32)
+    for i, c in enumerate(chunks):
+        tokens = _tokenize(f"{c.title}\n{c.content}")
+        lengths[i] = max(len(tokens), 1)
+        for tok in tokens:
+            per_doc = counts.setdefault(tok, {})
+            per_doc[i] = per_doc.get(i, 0) + 1
+
+    postings: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+    for tok, per_doc in counts.items():
+        idx = np.fromiter(per_doc.keys(), dtype=np.int32, count=len(per_doc))
+        tf = np.fromiter(per_doc.values(), dtype=np.float32, count=len(per_doc))
+        idf = np.log((1.0 + n_docs) / (1.0 + len(per_doc))) + 1.0
+        postings[tok] = (idx, (tf / lengths[idx]) * np.float32(idf))
+    return _LexIndex(postings=postings, n_docs=n_docs)
+
+
+def _rank_chunks(
+    query: str,
+    chunks: list[chunker.Chunk],
+    top_k: int = 5,
+) -> list[chunker.Chunk]:
+    """Rank chunks by TF-IDF overlap with the query — no model, no cache.
+
+    Selected with CONTEXT7_RANKER=tfidf; useful where downloading the
+    embedding model is not an option. Scoring iterates the few query
+    tokens rather than the many documents: each token's posting list is
+    added into the score vector with one fancy-indexed accumulate, so
+    documents sharing no terms with the query are never touched. The
+    index is built once per chunk set and reused across queries.
+    """
+    if not chunks:
+        return []
+
+    global _lex_index_cache  # noqa: PLW0603
+    key = tuple(_content_hash(c) for c in chunks)
+    if _lex_index_cache is None or _lex_index_cache[0] != key:
+        _lex_index_cache = (key, _build_lex_index(chunks))
+    index = _lex_index_cache[1]
+
+    scores = np.zeros(index.n_docs, dtype=np.float32)
+    matched = False
+    for tok in set(_tokenize(query)):
+        posting = index.postings.get(tok)
+        if posting is not None:
+            scores[posting[0]] += posting[1]
+            matched = True
+    if not matched:
+        return chunks[:top_k]
+
+    k = min(top_k, index.n_docs)
+    part = np.argpartition(-scores, k - 1)[:k]
+    ranked_idx = part[np.argsort(-scores[part])]
+    return [chunks[int(i)] for i in ranked_idx]
 
 
 # ---------------------------------------------------------------------------
@@ -189,11 +387,135 @@ def _is_docs_url(url: str) -> bool:
 # ---------------------------------------------------------------------------
 
 
+# Reusable score buffer: repeated queries against the same corpus write
+# their N inner products into the same allocation instead of a fresh one.
+_score_buf: np.ndarray | None = None
+
+
+def _scores_buffer(n: int, dtype: np.dtype) -> np.ndarray:
+    global _score_buf  # noqa: PLW0603
+    if _score_buf is None or _score_buf.shape[0] != n or _score_buf.dtype != dtype:
+        _score_buf = np.empty(n, dtype=dtype)
+    return _score_buf
+
+
+def _cosine_scores(doc_matrix: np.ndarray, q_vec: np.ndarray) -> np.ndarray:
+    """Inner products of the query against L2-normalised matrix rows.
+
+    Rows are unit vectors, so inner product == cosine similarity. Uses
+    SimSIMD's AVX/NEON kernels when installed (several times faster than
+    generic BLAS for these small-D matrices), falling back to numpy. The
+    returned array may be a shared buffer — consume it before the next
+    call.
+    """
+    if not doc_matrix.flags.c_contiguous:
+        # Cached matrices are saved contiguous; this only fires for ad-hoc
+        # views and keeps both SimSIMD and the strided-BLAS path honest.
+        doc_matrix = np.ascontiguousarray(doc_matrix)
+    if np.issubdtype(doc_matrix.dtype, np.integer):
+        # int8-quantised cache: symmetric scales are positive constants,
+        # so the raw int8 dot preserves cosine ordering — no dequantization.
+        q_i8 = np.clip(np.rint(q_vec * 127.0), -127, 127).astype(np.int8)
+        if simsimd is not None:
+            try:
+                dots = simsimd.cdist(q_i8.reshape(1, -1), doc_matrix, metric="dot")
+                return np.asarray(dots, dtype=np.float32).ravel()
+            except (TypeError, ValueError):
+                pass
+        return doc_matrix.astype(np.float32) @ q_i8.astype(np.float32)
+
+    q = q_vec.astype(doc_matrix.dtype, copy=False)
+    if simsimd is not None:
+        try:
+            # cdist with metric="dot" returns the raw inner products
+            dots = simsimd.cdist(q.reshape(1, -1), doc_matrix, metric="dot")
+            return np.asarray(dots, dtype=np.float32).ravel()
+        except (TypeError, ValueError):
+            pass  # unsupported dtype/layout — use the numpy path
+    return np.dot(doc_matrix, q, out=_scores_buffer(doc_matrix.shape[0], doc_matrix.dtype))
+
+
 def _chunk_id(chunk: chunker.Chunk) -> str:
     """Stable string identifier for a chunk used as matrix row index."""
     return f"{chunk.source}::{chunk.title}"
 
 
+def _is_permutation(cached_ids: list[str], current_ids: list[str]) -> bool:
+    """True if the id lists hold the same unique ids in a different order."""
+    return (
+        len(cached_ids) == len(current_ids)
+        and len(set(current_ids)) == len(current_ids)
+        and set(cached_ids) == set(current_ids)
+    )
+
+
+def _content_hash(chunk: chunker.Chunk) -> str:
+    """Digest of a chunk's embedded text, independent of its position."""
+    return hashlib.sha256(f"{chunk.title}\n{chunk.content}".encode()).hexdigest()
+
+
+def _embed_chunks(
+    owner: str,
+    repo: str,
+    chunks: list[chunker.Chunk],
+    current_ids: list[str],
+    cached: tuple[list[str], np.ndarray] | None,
+) -> np.ndarray:
+    """Build the (N, D) embedding matrix, reusing cached rows where possible.
+
+    Rows from the previous matrix are matched by content hash, so editing
+    one file (or merely reordering chunks) re-embeds only the chunks whose
+    text actually changed instead of the whole corpus.
+    """
+    current_hashes = [_content_hash(c) for c in chunks]
+
+    row_of: dict[str, int] = {}
+    old: np.ndarray | None = None
+    cached_hashes = cache.load_chunk_hashes(owner, repo)
+    if (
+        cached is not None
+        and cached_hashes is not None
+        and len(cached_hashes) == cached[1].shape[0]
+        # int8 rows lost their scale at quantisation time — can't be spliced
+        # next to freshly embedded float32 rows.
+        and not np.issubdtype(cached[1].dtype, np.integer)
+    ):
+        old = np.asarray(cached[1], dtype=np.float32)
+        row_of = {h: i for i, h in enumerate(cached_hashes)}
+
+    missing = [i for i, h in enumerate(current_hashes) if h not in row_of]
+
+    if old is not None and not missing:
+        matrix = old[[row_of[h] for h in current_hashes]]
+    elif old is None or len(missing) == len(chunks):
+        texts = [f"{c.title}\n{c.content}" for c in chunks]
+        matrix = embedder.embed_texts(texts, _BULK_EMBED_BATCH)
+    else:
+        texts = [f"{chunks[i].title}\n{chunks[i].content}" for i in missing]
+        new_vecs = embedder.embed_texts(texts, _BULK_EMBED_BATCH)
+        if new_vecs.shape[1] != old.shape[1]:
+            # Embedding model changed since last index — start over.
+            texts = [f"{c.title}\n{c.content}" for c in chunks]
+            matrix = embedder.embed_texts(texts, _BULK_EMBED_BATCH)
+        else:
+            matrix = np.empty((len(chunks), old.shape[1]), dtype=np.float32)
+            for i, h in enumerate(current_hashes):
+                if h in row_of:
+                    matrix[i] = old[row_of[h]]
+            for row, i in zip(new_vecs, missing, strict=True):
+                matrix[i] = row
+            log.info(
+                "Reused %d cached embeddings, embedded %d new chunks (%s/%s).",
+                len(chunks) - len(missing),
+                len(missing),
+                owner,
+                repo,
+            )
+
+    cache.save_embeddings(owner, repo, current_ids, matrix, chunk_hashes=current_hashes)
+    return matrix
+
+
 async def _rank_chunks_semantic(
     query: str,
     owner: str,
@@ -205,8 +527,9 @@ async def _rank_chunks_semantic(
 
     Strategy:
       1. Try to load a pre-built embedding matrix from the file cache.
-      2. If the cache is stale / missing, regenerate embeddings for all chunks
-         and persist them so subsequent queries are instant.
+      2. If the cache is stale / missing, rebuild the matrix — reusing rows
+         for unchanged chunks — and persist it so subsequent queries are
+         instant.
       3. Compute query embedding, then dot-product against the matrix
          (rows are L2-normalised, so dot == cosine similarity).
     """
@@ -217,28 +540,54 @@ async def _rank_chunks_semantic(
 
     # Try to load persisted embeddings
     cached = cache.load_embeddings(owner, repo)
-    if cached is not None:
-        cached_ids, doc_matrix = cached
-        if cached_ids == current_ids:
-            log.debug("Embedding cache hit for %s/%s (%d chunks)", owner, repo, len(chunks))
-        else:
-            # Docs changed since last embed — regenerate
-            log.info("Embedding cache stale for %s/%s, regenerating.", owner, repo)
+    if cached is not None and cached[0] == current_ids:
+        log.debug("Embedding cache hit for %s/%s (%d chunks)", owner, repo, len(chunks))
+        doc_matrix = cached[1]
+    elif cached is not None and _is_permutation(cached[0], current_ids):
+        # Same chunks, new order (e.g. files listed in a different order) —
+        # one fancy-indexed gather instead of any model call.
+        log.debug("Embedding cache reordered for %s/%s; permuting rows.", owner, repo)
+        idx_of = {cid: i for i, cid in enumerate(cached[0])}
+        perm = np.fromiter(
+            (idx_of[c] for c in current_ids), dtype=np.int64, count=len(current_ids)
+        )
+        doc_matrix = cached[1][perm]  # advanced indexing → in-memory copy
+        if not np.issubdtype(doc_matrix.dtype, np.integer):
+            # Persist the new order so the next query is a plain hit.
+            # (int8 caches are left alone: re-saving rows that are already
+            # quantised would clobber the recorded scale.) Drop the memmap
+            # first: Windows cannot replace a file that is still mapped.
             cached = None
-
-    if cached is None:
-        log.info("Generating embeddings for %d chunks (%s/%s)…", len(chunks), owner, repo)
-        texts = [f"{c.title}\n{c.content}" for c in chunks]
-        doc_matrix = await asyncio.to_thread(embedder.embed_texts, texts)  # (N, D) float32
-        cache.save_embeddings(owner, repo, current_ids, doc_matrix)
+            cache.save_embeddings(
+                owner,
+                repo,
+                current_ids,
+                doc_matrix,
+                chunk_hashes=[_content_hash(c) for c in chunks],
+            )
+    else:
+        if cached is not None:
+            log.info("Embedding cache stale for %s/%s, updating.", owner, repo)
+            # Materialise the rows we may reuse and release the memmap —
+            # _embed_chunks rewrites _embeddings.npy, and Windows cannot
+            # replace a file that is still mapped.
+            cached = (cached[0], np.array(cached[1]))
+        else:
+            log.info("Generating embeddings for %d chunks (%s/%s)…", len(chunks), owner, repo)
+        doc_matrix = await asyncio.to_thread(
+            _embed_chunks, owner, repo, chunks, current_ids, cached
+        )  # (N, D) float32
         log.info("Embeddings persisted for %s/%s.", owner, repo)
 
-    # Embed the query and compute cosine similarities via dot product
+    # Embed the query and score against the chunk matrix
     q_vec = await asyncio.to_thread(embedder.embed_query, query)  # (D,) unit vector
-    scores: np.ndarray = doc_matrix @ q_vec  # (N,) cosine similarities
-
-    # Pick top-k indices (stable argsort descending)
-    top_indices = int(min(top_k, len(chunks)))
-    ranked_idx = np.argsort(-scores)[:top_indices]
+    scores = _cosine_scores(doc_matrix, q_vec)
+
+    # Pick top-k indices: O(N) partial selection, then sort only the k
+    # winners. Selecting the *top* of the ascending order avoids negating
+    # scores (an N-float copy); the final [::-1] is a view, not a copy.
+    k = min(top_k, len(chunks))
+    part = np.argpartition(scores, len(scores) - k)[-k:]
+    ranked_idx = part[np.argsort(scores[part])][::-1]
 
     return [chunks[int(i)] for i in ranked_idx]
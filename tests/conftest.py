@@ -16,7 +16,7 @@ def mock_embedder(monkeypatch):
     embed_query returns a (4,) unit vector [1, 0, 0, 0].
     """
 
-    def fake_embed_texts(texts: list[str]) -> np.ndarray:
+    def fake_embed_texts(texts: list[str], batch_size: int | None = None) -> np.ndarray:
         rng = np.random.default_rng(seed=42)
         n = len(texts)
         if n == 0:
@@ -3,6 +3,8 @@
 import json
 import time
 
+import numpy as np
+
 from context7_local import cache
 
 
@@ -47,6 +49,38 @@ class TestCache:
         assert "_meta.json" not in docs
         assert "readme.md" in docs
 
+    def test_mark_fetched_persists_validators(self, tmp_path, monkeypatch) -> None:
+        monkeypatch.setenv("CACHE_DIR", str(tmp_path))
+        cache.mark_fetched(
+            "o", "r", etags={"readme.md": 'W/"abc"'}, shas={"docs/a.md": "deadbeef"}
+        )
+
+        meta = cache.load_meta("o", "r")
+        assert meta["etags"] == {"readme.md": 'W/"abc"'}
+        assert meta["shas"] == {"docs/a.md": "deadbeef"}
+
+    def test_int8_embedding_cache(self, tmp_path, monkeypatch) -> None:
+        monkeypatch.setenv("CACHE_DIR", str(tmp_path))
+        monkeypatch.setenv("EMBED_CACHE_DTYPE", "int8")
+        matrix = np.array([[0.6, 0.8], [1.0, 0.0]], dtype=np.float32)
+
+        cache.save_embeddings("o", "r", ["a", "b"], matrix)
+        loaded = cache.load_embeddings("o", "r")
+
+        assert loaded is not None
+        ids, stored = loaded
+        assert ids == ["a", "b"]
+        assert stored.dtype == np.int8
+        assert int(np.abs(stored).max()) == 127
+
+    def test_chunks_roundtrip(self, tmp_path, monkeypatch) -> None:
+        monkeypatch.setenv("CACHE_DIR", str(tmp_path))
+        rows = [["Title", "body text", "readme.md"]]
+
+        cache.save_chunks("o", "r", rows)
+        assert cache.load_chunks("o", "r") == rows
+        assert cache.load_chunks("o", "other") is None
+
     def test_nested_doc_path(self, tmp_path, monkeypatch) -> None:
         monkeypatch.setenv("CACHE_DIR", str(tmp_path))
         cache.save_doc("o", "r", "docs/guide/intro.md", "# Intro")
@@ -208,7 +208,7 @@ class TestScrapDocsSite:
 
         mock_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
 
-        with patch("context7_local.scraper.httpx.AsyncClient", return_value=mock_client):
+        with patch("context7_local.scraper._get_client", return_value=mock_client):
             result = await scrape_docs_site("https://docs.example.com", max_pages=1)
 
         assert len(result) >= 1
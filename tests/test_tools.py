@@ -29,6 +29,24 @@ class TestResolveLibraryId:
             assert "/facebook/react" in result
             assert "200,000" in result
 
+    @pytest.mark.asyncio
+    async def test_repeat_query_served_from_cache(self, monkeypatch) -> None:
+        from context7_local import tools
+
+        monkeypatch.setattr(tools, "_resolve_cache", {})
+        mock_repos = [
+            github_client.RepoInfo(
+                owner="o", repo="r", description="d", stars=1, language="Python"
+            ),
+        ]
+        with patch.object(
+            github_client, "search_repositories", new_callable=AsyncMock, return_value=mock_repos
+        ) as mock_search:
+            first = await resolve_library_id("samelib")
+            second = await resolve_library_id("samelib")
+        assert first == second
+        assert mock_search.await_count == 1
+
     @pytest.mark.asyncio
     async def test_no_results(self) -> None:
         with patch.object(
@@ -65,7 +83,7 @@ class TestQueryDocs:
                 github_client,
                 "fetch_readme",
                 new_callable=AsyncMock,
-                return_value="# README\nHello",
+                return_value=github_client.FetchedDoc("# README\nHello"),
             ),
             patch.object(
                 github_client, "list_docs_directory", new_callable=AsyncMock, return_value=[]
@@ -123,17 +141,117 @@ class TestRankChunksSemantic:
         await _rank_chunks_semantic("q2", "owner", "repo", chunks, top_k=1)
         assert call_count["n"] == 0, "embed_texts should not be called on cache hit"
 
+    @pytest.mark.asyncio
+    async def test_only_new_chunks_are_embedded(self, tmp_path, monkeypatch) -> None:
+        """Adding one chunk re-embeds only that chunk, reusing cached rows."""
+        import numpy as np
+
+        monkeypatch.setenv("CACHE_DIR", str(tmp_path))
+        chunks = [
+            chunker.Chunk(title="A", content="alpha", source="a.md"),
+            chunker.Chunk(title="B", content="beta", source="b.md"),
+        ]
+        await _rank_chunks_semantic("q1", "owner", "repo", chunks, top_k=1)
+
+        embedded_texts: list[str] = []
+
+        def recording_embed(texts, batch_size=None):
+            embedded_texts.extend(texts)
+            return np.full((len(texts), 4), 0.5, dtype=np.float32)
+
+        monkeypatch.setattr(embedder, "embed_texts", recording_embed)
+
+        extended = chunks + [chunker.Chunk(title="C", content="gamma", source="c.md")]
+        await _rank_chunks_semantic("q2", "owner", "repo", extended, top_k=1)
+        assert embedded_texts == ["C\ngamma"]
+
+    @pytest.mark.asyncio
+    async def test_reordered_chunks_reuse_cache(self, tmp_path, monkeypatch) -> None:
+        """Reordering the same chunks permutes cached rows — no model call."""
+        monkeypatch.setenv("CACHE_DIR", str(tmp_path))
+        chunks = [
+            chunker.Chunk(title="A", content="alpha", source="a.md"),
+            chunker.Chunk(title="B", content="beta", source="b.md"),
+        ]
+        await _rank_chunks_semantic("q1", "owner", "repo", chunks, top_k=1)
+
+        def failing_embed(texts, batch_size=None):
+            raise AssertionError("embed_texts should not run on reorder")
+
+        monkeypatch.setattr(embedder, "embed_texts", failing_embed)
+        await _rank_chunks_semantic("q2", "owner", "repo", chunks[::-1], top_k=1)
+
     @pytest.mark.asyncio
     async def test_empty_chunks_returns_empty(self, tmp_path, monkeypatch) -> None:
         monkeypatch.setenv("CACHE_DIR", str(tmp_path))
         result = await _rank_chunks_semantic("anything", "owner", "repo", [], top_k=5)
         assert result == []
 
+    def test_cosine_scores_match_numpy(self) -> None:
+        """_cosine_scores must agree with the plain matmul regardless of backend."""
+        import numpy as np
+
+        from context7_local.tools import _cosine_scores
+
+        mat = np.eye(4, dtype=np.float32)
+        q = np.array([0.9, 0.3, 0.1, 0.0], dtype=np.float32)
+        scores = _cosine_scores(mat, q)
+        np.testing.assert_allclose(scores, mat @ q, atol=1e-3)
+        assert int(np.argmax(scores)) == 0
+
     def test_chunk_id_format(self) -> None:
         chunk = chunker.Chunk(title="My Title", content="content", source="readme.md")
         assert _chunk_id(chunk) == "readme.md::My Title"
 
 
+class TestRankChunksLexical:
+    """Tests for the TF-IDF fallback ranker."""
+
+    def test_tokenize_case_folds_and_splits_punctuation(self) -> None:
+        from context7_local.tools import _tokenize
+
+        assert _tokenize("Hello, World_2! (foo-bar)") == ["hello", "world_2", "foo", "bar"]
+
+    def test_relevant_chunk_ranks_first(self) -> None:
+        from context7_local.tools import _rank_chunks
+
+        chunks = [
+            chunker.Chunk(title="Install", content="pip install the package", source="a.md"),
+            chunker.Chunk(title="License", content="MIT license text", source="b.md"),
+            chunker.Chunk(title="Usage", content="run the CLI after install", source="c.md"),
+        ]
+        ranked = _rank_chunks("pip install", chunks, top_k=2)
+        assert len(ranked) == 2
+        assert ranked[0].title == "Install"
+
+    def test_no_overlap_returns_leading_chunks(self) -> None:
+        from context7_local.tools import _rank_chunks
+
+        chunks = [chunker.Chunk(title="A", content="alpha", source="a.md")]
+        ranked = _rank_chunks("zzz unmatched", chunks, top_k=5)
+        assert ranked == chunks
+
+    def test_index_reused_across_queries(self, monkeypatch) -> None:
+        from context7_local import tools
+
+        builds = {"n": 0}
+        real_build = tools._build_lex_index
+
+        def counting_build(chunks):
+            builds["n"] += 1
+            return real_build(chunks)
+
+        monkeypatch.setattr(tools, "_build_lex_index", counting_build)
+        monkeypatch.setattr(tools, "_lex_index_cache", None)
+        chunks = [
+            chunker.Chunk(title="A", content="alpha beta", source="a.md"),
+            chunker.Chunk(title="B", content="gamma delta", source="b.md"),
+        ]
+        tools._rank_chunks("alpha", chunks, top_k=1)
+        tools._rank_chunks("gamma", chunks, top_k=1)
+        assert builds["n"] == 1
+
+
 class TestFetchAndCacheWithScraper:
     """Test the website-augmented fetch pipeline."""
 
@@ -146,7 +264,7 @@ class TestFetchAndCacheWithScraper:
                 github_client,
                 "fetch_readme",
                 new_callable=AsyncMock,
-                return_value="# README\nHello",
+                return_value=github_client.FetchedDoc("# README\nHello"),
             ),
             patch.object(
                 github_client, "list_docs_directory", new_callable=AsyncMock, return_value=[]
@@ -175,7 +293,7 @@ class TestFetchAndCacheWithScraper:
                 github_client,
                 "fetch_readme",
                 new_callable=AsyncMock,
-                return_value="# README\nHello",
+                return_value=github_client.FetchedDoc("# README\nHello"),
             ),
             patch.object(
                 github_client, "list_docs_directory", new_callable=AsyncMock, return_value=[]